@@ -2,11 +2,13 @@
 import streamlit as st
 from transformers import MarianMTModel, MarianTokenizer
 import torch
-from typing import Tuple
+from typing import Optional, Tuple
 import html
+import os
 import io
 import time
 import streamlit.components.v1 as components
+from shortlist import LexicalShortlist, generate_with_shortlist
 
 # ---------------- Page config (must be first Streamlit call) ----------------
 st.set_page_config(
@@ -44,6 +46,12 @@ max_input_chars = st.sidebar.number_input(
     help="Maximum number of characters allowed in a single translation"
 )
 
+shortlist_path = st.sidebar.text_input(
+    "Lexical shortlist file (optional)",
+    value="",
+    help="Restrict the output vocabulary to likely words for faster CPU decoding. Build one with build_shortlist.py."
+)
+
 show_model_info = st.sidebar.checkbox("Show model info after load", value=True)
 
 st.sidebar.markdown("---")
@@ -67,6 +75,11 @@ def load_model_and_tokenizer(name: str, device: str) -> Tuple[MarianMTModel, Mar
         model.to("cpu")
     return model, tokenizer
 
+@st.cache_resource
+def load_shortlist(path: str, mtime: float) -> LexicalShortlist:
+    # mtime is only part of the cache key, so a rebuilt file is picked up
+    return LexicalShortlist.load(path)
+
 # Show spinner while loading
 with st.spinner(f"🔄 Loading model {model_name} on {device_opt}... This may take a moment."):
     try:
@@ -75,6 +88,15 @@ with st.spinner(f"🔄 Loading model {model_name} on {device_opt}... This may ta
         st.error(f"❌ Error loading model: {e}")
         st.stop()
 
+shortlist = None
+if shortlist_path.strip():
+    try:
+        shortlist = load_shortlist(shortlist_path.strip(), os.path.getmtime(shortlist_path.strip()))
+        shortlist.check(model, model_name)
+    except Exception as e:
+        shortlist = None
+        st.sidebar.warning(f"⚠️ Could not load shortlist, using full vocabulary: {e}")
+
 if show_model_info:
     st.sidebar.success(f"✅ Model loaded successfully!\n\n**Model:** {model_name}\n\n**Device:** {device_opt.upper()}")
 
@@ -420,7 +442,8 @@ if "messages" not in st.session_state:
     st.session_state.messages = []  # each msg: {"role": "user"|"bot", "content": str, "time": float}
 
 # ---------------- Helper: translation ----------------
-def translate_text(text: str, tokenizer: MarianTokenizer, model: MarianMTModel, device: str, max_len=512) -> str:
+def translate_text(text: str, tokenizer: MarianTokenizer, model: MarianMTModel, device: str, max_len=512,
+                   shortlist: Optional[LexicalShortlist] = None) -> str:
     # basic safety/length handling
     if len(text) == 0:
         return ""
@@ -431,7 +454,7 @@ def translate_text(text: str, tokenizer: MarianTokenizer, model: MarianMTModel,
     tokens = tokenizer(text, return_tensors="pt", padding=True, truncation=True, max_length=max_len)
     if device == "cuda" and torch.cuda.is_available():
         tokens = {k: v.to("cuda") for k, v in tokens.items()}
-    outputs = model.generate(**tokens, max_length=2 * tokens["input_ids"].shape[-1] + 50, num_beams=5, early_stopping=True)
+    outputs = generate_with_shortlist(model, shortlist, **tokens, max_length=2 * tokens["input_ids"].shape[-1] + 50, num_beams=5, early_stopping=True)
     translated = tokenizer.decode(outputs[0], skip_special_tokens=True)
     return translated
 
@@ -593,7 +616,7 @@ if st.session_state.messages:
         # Translate synchronously (blocking)
         try:
             with st.spinner("🔄 Translating your message..."):
-                translation = translate_text(last["content"], tokenizer, model, device_opt)
+                translation = translate_text(last["content"], tokenizer, model, device_opt, shortlist=shortlist)
         except Exception as e:
             st.error(f"❌ Translation failed: {e}", icon="❌")
             translation = "⚠️ Error during translation. Please try again."
@@ -0,0 +1,157 @@
+# build_shortlist.py
+"""Build a lexical shortlist file for ``shortlist.py`` from a local corpus.
+
+Statistics come from one of:
+  * a parallel corpus alone (sentence-level co-occurrence, p(target | source)),
+  * a parallel corpus plus word alignments in Pharaoh "i-j" format
+    (e.g. fast_align / eflomal output),
+  * a bilingual word table: ``source<TAB>target[<TAB>probability]`` per line.
+
+Words are mapped onto the model's SentencePiece ids, so the resulting file is
+tied to the model it was built with.
+
+Examples:
+    python build_shortlist.py --src corpus.en --tgt corpus.fr -o shortlist.json
+    python build_shortlist.py --src corpus.en --tgt corpus.fr --align corpus.align -o shortlist.json
+    python build_shortlist.py --lexicon en-fr.tsv -o shortlist.json
+"""
+import argparse
+from collections import Counter, defaultdict
+from typing import Dict, List, Set
+
+from transformers import MarianConfig, MarianTokenizer
+
+from shortlist import LexicalShortlist
+
+
+def source_ids(tokenizer: MarianTokenizer, text: str) -> List[int]:
+    return tokenizer(text, add_special_tokens=False)["input_ids"]
+
+
+def target_ids(tokenizer: MarianTokenizer, text: str) -> List[int]:
+    return tokenizer(text_target=text, add_special_tokens=False)["input_ids"]
+
+
+def read_lines(path: str, max_lines: int) -> List[str]:
+    lines = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if max_lines and len(lines) >= max_lines:
+                break
+            lines.append(line.rstrip("\n"))
+    return lines
+
+
+def count_cooccurrence(tokenizer, src_lines, tgt_lines, pair_counts, src_counts, tgt_freq):
+    for src, tgt in zip(src_lines, tgt_lines):
+        s_ids = set(source_ids(tokenizer, src))
+        t_ids = target_ids(tokenizer, tgt)
+        tgt_freq.update(t_ids)
+        t_set = set(t_ids)
+        for s in s_ids:
+            src_counts[s] += 1
+            pair_counts[s].update(t_set)
+
+
+def count_alignments(tokenizer, src_lines, tgt_lines, align_lines, pair_counts, src_counts, tgt_freq):
+    for src, tgt, align in zip(src_lines, tgt_lines, align_lines):
+        src_words, tgt_words = src.split(), tgt.split()
+        src_pieces = [source_ids(tokenizer, w) for w in src_words]
+        tgt_pieces = [target_ids(tokenizer, w) for w in tgt_words]
+        for pieces in tgt_pieces:
+            tgt_freq.update(pieces)
+        for pieces in src_pieces:
+            src_counts.update(pieces)
+        for link in align.split():
+            i, j = link.replace("p", "-").split("-")[:2]
+            i, j = int(i), int(j)
+            if i >= len(src_pieces) or j >= len(tgt_pieces):
+                continue
+            for s in src_pieces[i]:
+                pair_counts[s].update(tgt_pieces[j])
+
+
+def count_lexicon(tokenizer, lexicon_lines, pair_counts, src_counts, tgt_freq):
+    for line in lexicon_lines:
+        parts = line.split("\t")
+        if len(parts) < 2:
+            continue
+        prob = float(parts[2]) if len(parts) > 2 else 1.0
+        s_pieces = source_ids(tokenizer, parts[0])
+        t_pieces = target_ids(tokenizer, parts[1])
+        for t in t_pieces:
+            tgt_freq[t] += prob
+        for s in s_pieces:
+            src_counts[s] += prob
+            for t in t_pieces:
+                pair_counts[s][t] += prob
+
+
+def select(pair_counts, src_counts, top_k: int, min_prob: float, always: Set[int]) -> Dict[int, List[int]]:
+    table = {}
+    for s, counts in pair_counts.items():
+        total = src_counts[s] or 1
+        best = []
+        # frequent function words top every list but are always allowed anyway,
+        # so skip them and spend the top-k budget on real translations
+        for t, c in counts.most_common():
+            if len(best) >= top_k or c / total < min_prob:
+                break
+            if t not in always:
+                best.append(t)
+        if best:
+            table[s] = best
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a lexical shortlist for a Marian model.")
+    parser.add_argument("--model", default="Helsinki-NLP/opus-mt-en-fr", help="Hugging Face model name")
+    parser.add_argument("--src", help="source side of the parallel corpus, one sentence per line")
+    parser.add_argument("--tgt", help="target side of the parallel corpus, one sentence per line")
+    parser.add_argument("--align", help="word alignments for --src/--tgt in Pharaoh 'i-j' format")
+    parser.add_argument("--lexicon", help="bilingual word table: source<TAB>target[<TAB>prob]")
+    parser.add_argument("--top-k", type=int, default=50, help="target candidates kept per source token, besides the always-allowed ones")
+    parser.add_argument("--min-prob", type=float, default=0.001, help="drop candidates with p(t|s) below this")
+    parser.add_argument("--frequent", type=int, default=500, help="most frequent target tokens always allowed")
+    parser.add_argument("--max-lines", type=int, default=0, help="read at most this many lines (0 = all)")
+    parser.add_argument("-o", "--output", default="shortlist.json", help="output shortlist file")
+    args = parser.parse_args()
+
+    if not args.lexicon and not (args.src and args.tgt):
+        parser.error("give either --src and --tgt, or --lexicon")
+
+    tokenizer = MarianTokenizer.from_pretrained(args.model)
+    pair_counts = defaultdict(Counter)
+    src_counts, tgt_freq = Counter(), Counter()
+
+    if args.src and args.tgt:
+        src_lines = read_lines(args.src, args.max_lines)
+        tgt_lines = read_lines(args.tgt, args.max_lines)
+        if len(src_lines) != len(tgt_lines):
+            parser.error(f"--src has {len(src_lines)} lines but --tgt has {len(tgt_lines)}")
+        if args.align:
+            align_lines = read_lines(args.align, args.max_lines)
+            count_alignments(tokenizer, src_lines, tgt_lines, align_lines, pair_counts, src_counts, tgt_freq)
+        else:
+            count_cooccurrence(tokenizer, src_lines, tgt_lines, pair_counts, src_counts, tgt_freq)
+    if args.lexicon:
+        count_lexicon(tokenizer, read_lines(args.lexicon, args.max_lines), pair_counts, src_counts, tgt_freq)
+
+    always = [t for t, _ in tgt_freq.most_common(args.frequent)]
+    always += [tokenizer.eos_token_id, tokenizer.pad_token_id, tokenizer.unk_token_id]
+
+    shortlist = LexicalShortlist(
+        table=select(pair_counts, src_counts, args.top_k, args.min_prob, set(always)),
+        always=always,
+        vocab_size=MarianConfig.from_pretrained(args.model).vocab_size,
+        model_name=args.model,
+    )
+    shortlist.save(args.output)
+    avg = sum(len(v) for v in shortlist.table.values()) / max(len(shortlist.table), 1)
+    print(f"✅ Wrote {args.output}: {len(shortlist.table)} source tokens, "
+          f"{avg:.1f} candidates each on average, {len(shortlist.always)} always allowed.")
+
+
+if __name__ == "__main__":
+    main()
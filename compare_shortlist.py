@@ -0,0 +1,109 @@
+# compare_shortlist.py
+"""Compare lexical-shortlist decoding against full-vocabulary decoding.
+
+Translates the same sentences twice with identical generation settings and
+reports speed, candidate vocabulary size and how often the outputs agree.
+If a reference file is given and ``sacrebleu`` is installed, BLEU for both
+runs is reported as well.
+
+Example:
+    python compare_shortlist.py --shortlist shortlist.json --src test.en --ref test.fr
+"""
+import argparse
+import time
+
+import torch
+from transformers import MarianMTModel, MarianTokenizer
+
+from shortlist import LexicalShortlist, decoding_candidates, generate_with_shortlist
+
+SAMPLE_SENTENCES = [
+    "Hello, how are you?",
+    "I am learning Python programming.",
+    "The weather is beautiful today.",
+    "Let's build a translation chatbot.",
+]
+
+
+def translate_all(sentences, tokenizer, model, shortlist, num_beams):
+    outputs, seconds = [], 0.0
+    for sentence in sentences:
+        tokens = tokenizer(sentence, return_tensors="pt", padding=True, truncation=True, max_length=512)
+        start = time.perf_counter()
+        with torch.no_grad():
+            generated = generate_with_shortlist(
+                model, shortlist, **tokens,
+                max_length=2 * tokens["input_ids"].shape[-1] + 50, num_beams=num_beams, early_stopping=True,
+            )
+        seconds += time.perf_counter() - start
+        outputs.append(tokenizer.decode(generated[0], skip_special_tokens=True))
+    return outputs, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare shortlist vs full-vocabulary decoding.")
+    parser.add_argument("--model", default="Helsinki-NLP/opus-mt-en-fr", help="Hugging Face model name")
+    parser.add_argument("--shortlist", required=True, help="shortlist file from build_shortlist.py")
+    parser.add_argument("--src", help="source sentences, one per line (default: built-in samples)")
+    parser.add_argument("--ref", help="reference translations, one per line, for BLEU")
+    parser.add_argument("--num-beams", type=int, default=5)
+    parser.add_argument("--max-lines", type=int, default=200)
+    args = parser.parse_args()
+
+    if args.src:
+        with open(args.src, "r", encoding="utf-8") as f:
+            sentences = [line.strip() for line in f][:args.max_lines]
+    else:
+        sentences = SAMPLE_SENTENCES
+    if not sentences:
+        parser.error(f"--src {args.src} has no lines")
+
+    refs = None
+    if args.ref:
+        with open(args.ref, "r", encoding="utf-8") as f:
+            refs = [line.strip() for line in f][:len(sentences)]
+        if len(refs) != len(sentences):
+            parser.error(f"--ref has {len(refs)} lines but there are {len(sentences)} source sentences")
+
+    tokenizer = MarianTokenizer.from_pretrained(args.model)
+    model = MarianMTModel.from_pretrained(args.model).to("cpu").eval()
+    shortlist = LexicalShortlist.load(args.shortlist)
+    try:
+        shortlist.check(model, args.model)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # warm-up so the first timed run does not pay one-off costs
+    translate_all(sentences[:1], tokenizer, model, None, args.num_beams)
+
+    full, full_time = translate_all(sentences, tokenizer, model, None, args.num_beams)
+    short, short_time = translate_all(sentences, tokenizer, model, shortlist, args.num_beams)
+
+    sizes = [len(decoding_candidates(model, shortlist, tokenizer(s, return_tensors="pt")["input_ids"]))
+             for s in sentences]
+    same = sum(a == b for a, b in zip(full, short))
+
+    print(f"Sentences:               {len(sentences)}")
+    print(f"Full vocabulary:         {shortlist.vocab_size} tokens, {full_time:.2f}s "
+          f"({1000 * full_time / len(sentences):.1f} ms/sentence)")
+    print(f"Shortlist:               {sum(sizes) / len(sizes):.0f} tokens on average, {short_time:.2f}s "
+          f"({1000 * short_time / len(sentences):.1f} ms/sentence)")
+    print(f"Speed-up:                {full_time / short_time:.2f}x")
+    print(f"Identical translations:  {same}/{len(sentences)} ({100 * same / len(sentences):.1f}%)")
+
+    if refs is not None:
+        try:
+            import sacrebleu
+        except ImportError:
+            print("❌ sacrebleu is NOT installed, skipping BLEU. Install it using: pip install sacrebleu")
+        else:
+            print(f"BLEU (full vocabulary):  {sacrebleu.corpus_bleu(full, [refs]).score:.2f}")
+            print(f"BLEU (shortlist):        {sacrebleu.corpus_bleu(short, [refs]).score:.2f}")
+
+    for a, b, s in zip(full, short, sentences):
+        if a != b:
+            print(f"\nEnglish  : {s}\nFull     : {a}\nShortlist: {b}")
+
+
+if __name__ == "__main__":
+    main()
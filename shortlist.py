@@ -0,0 +1,132 @@
+# shortlist.py
+"""Lexical shortlist support for Marian translation models.
+
+A shortlist maps every source token id to a small set of likely target token
+ids. At translation time the candidate vocabulary for an input is the union of
+those sets (plus a few always-allowed tokens), and the output projection of
+the model is computed only for those rows instead of the full vocabulary.
+
+Build a shortlist file with ``build_shortlist.py`` and compare it against
+full-vocabulary decoding with ``compare_shortlist.py``.
+"""
+import copy
+import json
+from typing import Dict, Iterable, List, Optional
+
+import torch
+from torch import nn
+from transformers import MarianMTModel
+
+
+class LexicalShortlist:
+    def __init__(self, table: Dict[int, List[int]], always: Iterable[int], vocab_size: int,
+                 model_name: str = "", copy_source: bool = True):
+        self.table = {int(k): [int(t) for t in v] for k, v in table.items()}
+        self.always = sorted(set(int(t) for t in always))
+        self.vocab_size = int(vocab_size)
+        self.model_name = model_name
+        # Marian en-fr models share one vocabulary between source and target,
+        # so source tokens (names, numbers, punctuation) are valid outputs too.
+        self.copy_source = copy_source
+
+    def candidates(self, input_ids: torch.Tensor) -> torch.Tensor:
+        """Return the sorted candidate target ids for a batch of source ids."""
+        allowed = set(self.always)
+        for src_id in set(input_ids.flatten().tolist()):
+            allowed.update(self.table.get(src_id, ()))
+            if self.copy_source:
+                allowed.add(src_id)
+        allowed = [t for t in allowed if 0 <= t < self.vocab_size]
+        return torch.tensor(sorted(allowed), dtype=torch.long, device=input_ids.device)
+
+    def check(self, model: MarianMTModel, model_name: Optional[str] = None) -> None:
+        """Raise ``ValueError`` if this shortlist was not built for ``model``."""
+        vocab_size = model.lm_head.out_features
+        if self.vocab_size != vocab_size:
+            raise ValueError(
+                f"Shortlist was built for a vocabulary of {self.vocab_size} tokens, "
+                f"but the model has {vocab_size}."
+            )
+        if model_name and self.model_name and self.model_name != model_name:
+            raise ValueError(f"Shortlist was built for {self.model_name}, not {model_name}.")
+
+    def save(self, path: str) -> None:
+        data = {
+            "model_name": self.model_name,
+            "vocab_size": self.vocab_size,
+            "copy_source": self.copy_source,
+            "always": self.always,
+            "table": {str(k): v for k, v in self.table.items()},
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+    @classmethod
+    def load(cls, path: str) -> "LexicalShortlist":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(
+            table=data["table"],
+            always=data["always"],
+            vocab_size=data["vocab_size"],
+            model_name=data.get("model_name", ""),
+            copy_source=data.get("copy_source", True),
+        )
+
+
+class ShortlistHead(nn.Module):
+    """Output projection restricted to ``candidate_ids``.
+
+    Logits are only computed for the candidate rows of the full projection and
+    scattered into a full-size tensor filled with ``-inf``, so ``generate``
+    (beam search, logits processors, decoder embeddings) keeps working on the
+    original token ids.
+    """
+
+    def __init__(self, full_head: nn.Linear, candidate_ids: torch.Tensor):
+        super().__init__()
+        self.vocab_size = full_head.out_features
+        self.register_buffer("candidate_ids", candidate_ids, persistent=False)
+        self.register_buffer("weight", full_head.weight.index_select(0, candidate_ids), persistent=False)
+        bias = full_head.bias.index_select(0, candidate_ids) if full_head.bias is not None else None
+        self.register_buffer("bias", bias, persistent=False)
+
+    def forward(self, hidden_states: torch.Tensor) -> torch.Tensor:
+        small = nn.functional.linear(hidden_states, self.weight, self.bias)
+        logits = small.new_full((*small.shape[:-1], self.vocab_size), float("-inf"))
+        logits[..., self.candidate_ids] = small
+        return logits
+
+
+def restricted_output(model: MarianMTModel, candidate_ids: torch.Tensor) -> MarianMTModel:
+    """Return a per-call view of ``model`` whose ``lm_head`` is a :class:`ShortlistHead`.
+
+    The view shares every other submodule and parameter with ``model`` but has
+    its own submodule table, so the shared (cached) model is never modified and
+    concurrent callers cannot see each other's vocabulary.
+    """
+    view = copy.copy(model)
+    view._modules = dict(model._modules)
+    view._modules["lm_head"] = ShortlistHead(model.lm_head, candidate_ids)
+    return view
+
+
+def decoding_candidates(model: MarianMTModel, shortlist: LexicalShortlist, input_ids: torch.Tensor) -> torch.Tensor:
+    """The candidate ids actually used for decoding ``input_ids`` with ``shortlist``."""
+    candidate_ids = shortlist.candidates(input_ids)
+    # never drop the tokens generation relies on, even with a hand-edited file
+    special = [t for t in (model.config.eos_token_id, model.config.pad_token_id) if t is not None]
+    return torch.unique(torch.cat([candidate_ids, candidate_ids.new_tensor(special)]))
+
+
+def generate_with_shortlist(model: MarianMTModel, shortlist: Optional[LexicalShortlist], **generate_kwargs):
+    """``model.generate`` with the output vocabulary restricted by ``shortlist``.
+
+    Falls back to full-vocabulary decoding when ``shortlist`` is ``None``.
+    """
+    if shortlist is None:
+        return model.generate(**generate_kwargs)
+    shortlist.check(model)
+    candidate_ids = decoding_candidates(model, shortlist, generate_kwargs["input_ids"])
+    with torch.no_grad():
+        return restricted_output(model, candidate_ids).generate(**generate_kwargs)